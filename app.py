@@ -5,17 +5,24 @@ from queue import Queue
 import os
 import json
 import time 
+import shutil
 
 # === IMPORT CORE MODULES ===
-
+# These modules only import the standard library at load time; their heavy
+# dependencies (cv2, pytesseract, mss, PIL, sounddevice, pyautogui...) are
+# loaded on first use so the window appears immediately.
 
 # Import the necessary classes from capture.py (assuming previous files are consolidated)
-from capture import ScreenCapturer, AudioCapturer, SCREEN_DIR as CAPTURE_DIR 
+from capture import ScreenCapturer, AudioCapturer, SCREEN_DIR as CAPTURE_DIR, AUDIO_DIR
 from process import Processor, DATA_DIR # Import necessary classes and paths
 # Import functions from summarize.py
-from summarize import summarize as run_summarize_logic, save_summary, load_events, OUTPUT_SUMMARY as SUMMARY_FILE
+from summarize import summarize as run_summarize_logic, save_summary, iter_events, OUTPUT_SUMMARY as SUMMARY_FILE
 # Import the automation function
 from automation_runner import run_automation
+# Background job runner so slow work never blocks the Tk main loop
+from task_executor import TaskExecutor
+# Low-priority worker that keeps data/ within its age and size budgets
+from retention import RetentionManager
 
 # ===== GLOBAL PATHS & SETUP =====
 # Use the DATA_DIR from the process module for consistency
@@ -24,16 +31,29 @@ DATA_DIR = DATA_DIR
 WORKFLOW_LOG_FILE = os.path.join(DATA_DIR, "processed_events.jsonl") 
 # The file where the Summarizer outputs the final JSON summary
 FINAL_SUMMARY_JSON = os.path.join(DATA_DIR, "workflow_summaries.json") 
-os.makedirs(DATA_DIR, exist_ok=True)
+# Prefix of directories that forget_data() has renamed and is deleting in the background
+TRASH_PREFIX = os.path.basename(DATA_DIR) + ".trash-"
+
+
+def purge_trash_dirs():
+    """Deletes any renamed data directories left behind (e.g. app closed mid-delete)."""
+    parent = os.path.dirname(DATA_DIR)
+    for name in os.listdir(parent):
+        if name.startswith(TRASH_PREFIX):
+            shutil.rmtree(os.path.join(parent, name), ignore_errors=True)
 
 
 class AGIAssistantApp:
     def __init__(self, root):
         self.root = root
         self.root.title("AGI Assistant Prototype")
-        self.root.geometry("400x350")
+        self.root.geometry("400x390")
         self.root.resizable(False, False)
         
+        # Create the data layout here rather than as an import side effect
+        for path in (DATA_DIR, CAPTURE_DIR, AUDIO_DIR):
+            os.makedirs(path, exist_ok=True)
+
         # Communication Queue for the threads
         self.data_queue = Queue() 
         
@@ -47,6 +67,19 @@ class AGIAssistantApp:
         
         self.is_recording = False
 
+        # Always-on disk budget enforcement (independent of recording)
+        self.retention = RetentionManager()
+        self.retention.start_retention()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Runs summarization / stop / automation jobs off the UI thread, each on
+        # its own lane so stopping capture never waits behind a long summary
+        self.executor = TaskExecutor(root)
+        self.summary_task = None  # Pending/running process_data task, for the Cancel button
+        # Bumped by forget_data(); a summary started before a forget must not be saved
+        self.data_generation = 0
+        self._data_lock = threading.Lock()
+
         # ===== UI Layout =====
         tk.Label(root, text="AGI Assistant Prototype", font=("Arial", 16, "bold")).pack(pady=10)
 
@@ -63,11 +96,38 @@ class AGIAssistantApp:
         self.auto_btn = tk.Button(root, text="🤖 Run Automation", width=20, command=self.trigger_automation, state=tk.DISABLED)
         self.auto_btn.pack(pady=5)
 
-        tk.Button(root, text="🧹 Forget All Data", width=20, command=self.forget_data).pack(pady=20)
+        self.cancel_btn = tk.Button(root, text="✖ Cancel Task", width=20, command=self.cancel_task, state=tk.DISABLED)
+        self.cancel_btn.pack(pady=5)
+
+        tk.Button(root, text="🧹 Forget All Data", width=20, command=self.forget_data).pack(pady=15)
 
         self.status_label = tk.Label(root, text="Status: Idle", fg="blue")
         self.status_label.pack()
 
+        # Clean up anything a previous forget_data() did not finish deleting
+        threading.Thread(target=purge_trash_dirs, daemon=True).start()
+
+    # ===== BACKGROUND TASK HELPERS =====
+    def _set_status(self, text, fg):
+        self.status_label.config(text=text, fg=fg)
+
+    def _show_progress(self, message, fraction=None):
+        if fraction is not None:
+            message = f"{message} ({fraction:.0%})"
+        self._set_status(f"Status: {message}", "orange")
+
+    def cancel_task(self):
+        # Only the summarization is cancellable; it may still be queued behind another job
+        if self.summary_task is not None:
+            self.summary_task.cancel()
+            self._set_status("Status: Cancelling...", "orange")
+
+    def on_close(self):
+        # Let the retention worker finish (or abort) its current file cleanly
+        self.retention.stop_retention()
+        self.retention.join(timeout=2.0)
+        self.root.destroy()
+
     # ===== CAPTURE CONTROL (CORRECTED) =====
     def start_capture(self):
         if self.is_recording:
@@ -83,6 +143,22 @@ class AGIAssistantApp:
         self.stop_btn.config(state=tk.NORMAL)
         self.auto_btn.config(state=tk.DISABLED)
         self.status_label.config(text="Status: Recording & Processing...", fg="green")
+        # Heavy libraries load inside the workers, so failures surface there
+        self.root.after(500, self._check_workers)
+
+    def _check_workers(self):
+        if not self.is_recording:
+            return
+        for worker in (self.capturer, self.audio_capturer, self.processor):
+            e = worker.startup_error
+            if e is not None:
+                self.stop_capture()
+                if isinstance(e, ImportError):
+                    messagebox.showerror("Import Error", f"A required module failed to import. Check installation/filenames: {e}")
+                else:
+                    messagebox.showerror("Error", f"Capture could not start: {e}")
+                return
+        self.root.after(500, self._check_workers)
 
     def stop_capture(self):
         if not self.is_recording:
@@ -93,14 +169,25 @@ class AGIAssistantApp:
         self.audio_capturer.stop_capture() # <-- New line
         self.processor.stop_processing()
         
-        # Wait a moment for threads to finish their current work
-        time.sleep(1.0) 
-        
+        self.stop_btn.config(state=tk.DISABLED)
+        self._set_status("Status: Stopping capture...", "orange")
+        # Wait for the threads to finish their current work in the background
+        self.executor.submit("stop_capture", self._wait_for_capture_threads,
+                             on_done=lambda _: self._on_capture_stopped(),
+                             on_error=lambda _: self._on_capture_stopped(),
+                             lane="capture")
+
+    def _wait_for_capture_threads(self, task, timeout=1.0):
+        deadline = time.monotonic() + timeout
+        for worker in (self.capturer, self.audio_capturer):
+            if worker.is_alive():
+                worker.join(timeout=max(0.0, deadline - time.monotonic()))
+
+    def _on_capture_stopped(self):
         self.is_recording = False
         self.start_btn.config(state=tk.NORMAL)
-        self.stop_btn.config(state=tk.DISABLED)
         self.auto_btn.config(state=tk.NORMAL) # Enable automation after capture stops
-        self.status_label.config(text="Status: Capture stopped", fg="red")
+        self._set_status("Status: Capture stopped", "red")
 
     # ===== SUMMARIZATION (POST-PROCESSING) =====
     def process_data(self):
@@ -108,31 +195,73 @@ class AGIAssistantApp:
             messagebox.showwarning("Warning", "Stop capture before processing data.")
             return
 
-        self.status_label.config(text="Status: Summarizing workflow...", fg="orange")
-        self.root.update() # Force UI update
+        self.process_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+        self._set_status("Status: Summarizing workflow...", "orange")
+        generation = self.data_generation
+        self.summary_task = self.executor.submit("process_data",
+                                                 lambda task: self._summarize_in_background(task, generation),
+                                                 on_progress=self._show_progress,
+                                                 on_done=self._on_summary_done,
+                                                 on_error=self._on_summary_error,
+                                                 on_cancelled=self._on_summary_cancelled)
 
-        try:
-            # 1. Load the raw processed events from the JSONL log file
-            events = load_events(WORKFLOW_LOG_FILE)
-            
-            if not events:
-                messagebox.showinfo("Info", "No new events to summarize.")
-                self.status_label.config(text="Status: Idle", fg="blue")
-                return
+    def _summarize_in_background(self, task, generation):
+        loaded = 0
 
-            # 2. Run the summarization logic
-            summary_list = run_summarize_logic(events)
+        # 1. Stream the raw processed events from the JSONL log and its compressed
+        #    segments straight into the summarizer, without holding them in memory
+        def stream_events():
+            nonlocal loaded
+            for event in iter_events(WORKFLOW_LOG_FILE):
+                loaded += 1
+                if loaded % 5000 == 0:
+                    task.check_cancelled()
+                    task.progress(f"Summarized {loaded} events...")
+                yield event
 
-            # 3. Save the summary to the final JSON file
+        # 2. Run the summarization logic
+        task.progress("Summarizing events...")
+        summary_list = run_summarize_logic(stream_events())
+        task.check_cancelled()
+        if not loaded:
+            return None
+
+        # 3. Save the summary to the final JSON file, unless the data it was
+        #    built from has been forgotten in the meantime
+        task.progress("Saving summary...")
+        with self._data_lock:
+            if generation != self.data_generation:
+                task.cancel()
+            task.check_cancelled()
             save_summary(summary_list, FINAL_SUMMARY_JSON)
-            
-            self.status_label.config(text=f"Status: Summary ready ({len(summary_list)} types) ✅", fg="green")
-            self.auto_btn.config(state=tk.NORMAL)
-            messagebox.showinfo("Processing Complete", f"Session summarized successfully! Found {len(summary_list)} unique workflow types.")
+        return summary_list
+
+    def _on_summary_done(self, summary_list):
+        self.summary_task = None
+        self.process_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+        if summary_list is None:
+            messagebox.showinfo("Info", "No new events to summarize.")
+            self._set_status("Status: Idle", "blue")
+            return
+
+        self._set_status(f"Status: Summary ready ({len(summary_list)} types) ✅", "green")
+        self.auto_btn.config(state=tk.NORMAL)
+        messagebox.showinfo("Processing Complete", f"Session summarized successfully! Found {len(summary_list)} unique workflow types.")
 
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred during summarization: {e}")
-            self.status_label.config(text="Status: Error", fg="red")
+    def _on_summary_error(self, e):
+        self.summary_task = None
+        self.process_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+        messagebox.showerror("Error", f"An error occurred during summarization: {e}")
+        self._set_status("Status: Error", "red")
+
+    def _on_summary_cancelled(self):
+        self.summary_task = None
+        self.process_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+        self._set_status("Status: Summarization cancelled", "gray")
 
     # ===== AUTOMATION EXECUTION (UNMODIFIED) =====
     def trigger_automation(self):
@@ -147,21 +276,54 @@ class AGIAssistantApp:
             {'action': 'move', 'x': 100, 'y': 100, 'delay': 1.0},
         ]
         
-        # Run automation in a separate thread to keep the GUI responsive
-        threading.Thread(target=lambda: self._execute_automation_in_thread(automation_steps), daemon=True).start()
-        
-    def _execute_automation_in_thread(self, steps):
-        self.status_label.config(text="Status: Automation running 🤖", fg="purple")
+        self._set_status("Status: Automation running 🤖", "purple")
         self.auto_btn.config(state=tk.DISABLED)
-        
-        # Execute the imported function
-        run_automation(steps) 
-        
-        self.status_label.config(text="Status: Automation executed 🤖", fg="blue")
+
+        # Run automation in the background to keep the GUI responsive
+        self.executor.submit("automation", lambda task: run_automation(automation_steps),
+                             on_done=lambda _: self._on_automation_finished(),
+                             on_error=self._on_automation_error,
+                             lane="automation")
+
+    def _on_automation_finished(self):
+        self._set_status("Status: Automation executed 🤖", "blue")
         self.auto_btn.config(state=tk.NORMAL)
 
-    # ===== FORGET DATA (UNMODIFIED) =====
+    def _on_automation_error(self, e):
+        # e.g. pyautogui missing or no display available
+        self._set_status("Status: Automation failed", "red")
+        self.auto_btn.config(state=tk.NORMAL)
+        messagebox.showerror("Error", f"Automation could not run: {e}")
+
+    # ===== FORGET DATA =====
     def forget_data(self):
+        # A summary in progress would otherwise write the forgotten data back
+        if self.summary_task is not None:
+            self.summary_task.cancel()
+
+        # Atomically move the whole data directory out of the way so the UI
+        # returns immediately, then delete the renamed copy in the background.
+        trash_dir = os.path.join(os.path.dirname(DATA_DIR), f"{TRASH_PREFIX}{time.time_ns()}")
+        try:
+            # Waits for a summary that is saving right now; later saves see the new generation
+            with self._data_lock:
+                self.data_generation += 1
+                os.rename(DATA_DIR, trash_dir)
+        except OSError:
+            # Rename can fail while files are held open (e.g. on Windows);
+            # fall back to deleting the files one by one, off the UI thread.
+            self._set_status("Status: Deleting data...", "orange")
+            self.executor.submit("forget_data", self._delete_data_files,
+                                 on_done=self._on_data_forgotten)
+            return
+
+        # Recreate the empty layout the capture/processor threads write into
+        for path in (DATA_DIR, CAPTURE_DIR, AUDIO_DIR):
+            os.makedirs(path, exist_ok=True)
+        threading.Thread(target=shutil.rmtree, args=(trash_dir, True), daemon=True).start()
+        self._on_data_forgotten(None)
+
+    def _delete_data_files(self, task):
         files_deleted = 0
         for root_dir, _, files in os.walk(DATA_DIR, topdown=False):
             for name in files:
@@ -170,13 +332,14 @@ class AGIAssistantApp:
                     files_deleted += 1
                 except Exception:
                     pass
-        
-        # Note: The 'self.screen_history' line assumes Processor state is handled
-        # in the GUI, but since it's an external thread, clearing the file system
-        # is the main step.
-        self.status_label.config(text=f"Status: Cleared {files_deleted} files 🧹", fg="gray")
-        messagebox.showinfo("Done", "All captured data deleted.")
+        return files_deleted
 
+    def _on_data_forgotten(self, files_deleted):
+        if files_deleted is None:
+            self._set_status("Status: Data cleared 🧹", "gray")
+        else:
+            self._set_status(f"Status: Cleared {files_deleted} files 🧹", "gray")
+        messagebox.showinfo("Done", "All captured data deleted.")
 
 if __name__ == "__main__":
     try:
@@ -190,7 +353,4 @@ if __name__ == "__main__":
         root.mainloop()
         
     except NameError:
-        messagebox.showerror("Setup Error", "Required classes (ScreenCapturer, AudioCapturer, Processor) not found. Ensure 'capture.py' and 'process.py' files exist and are correctly defined.")
-
-    except ImportError as e:
-        messagebox.showerror("Import Error", f"A required module failed to import. Check installation/filenames: {e}")
\ No newline at end of file
+        messagebox.showerror("Setup Error", "Required classes (ScreenCapturer, AudioCapturer, Processor) not found. Ensure 'capture.py' and 'process.py' files exist and are correctly defined.")
\ No newline at end of file
@@ -1,4 +1,8 @@
 # -*- mode: python ; coding: utf-8 -*-
+# Built as a one-folder app: a one-file exe has to unpack every bundled
+# library (OpenCV, numpy, ...) to a temp directory on each launch, which
+# dominated cold start. UPX is disabled for the same reason - decompressing
+# the DLLs at load time costs more than it saves.
 
 
 a = Analysis(
@@ -19,16 +23,13 @@ pyz = PYZ(a.pure)
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='app',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
+    upx=False,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -36,3 +37,13 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='app',
+)
@@ -2,8 +2,8 @@
 automation_runner.py
 A minimal runner that can execute tiny, safe automations using pyautogui.
 This is intentionally tiny — automations must be brief and strictly controlled.
+pyautogui is imported on first use, since loading it is slow.
 """
-import pyautogui
 import time
 
 def run_automation(steps: list):
@@ -16,6 +16,8 @@ def run_automation(steps: list):
                          {'action': 'click'},
                          {'action': 'write', 'text': 'Hello World'}]
     """
+    import pyautogui
+
     print("Starting automation...")
     
     for step in steps:
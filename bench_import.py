@@ -0,0 +1,118 @@
+"""
+bench_import.py
+Measures how long `import app` takes using Python's `-X importtime` and checks
+that none of the heavy capture/OCR/automation libraries are loaded at startup.
+
+Usage:
+    python bench_import.py                      # print a report
+    python bench_import.py --record             # also append the result to import_time.jsonl
+    python bench_import.py --budget-ms 150      # exit with status 1 if over budget
+"""
+import os
+import sys
+import json
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+
+# =============================================================================
+# 1. CONFIGURATION
+# =============================================================================
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_FILE = os.path.join(PROJECT_DIR, "import_time.jsonl")
+
+# Modules that must only be imported on first use, never while the GUI starts
+HEAVY_MODULES = (
+    "cv2", "pytesseract", "numpy", "mss", "PIL",
+    "sounddevice", "soundfile", "pyautogui",
+)
+
+# =============================================================================
+# 2. MEASUREMENT
+# =============================================================================
+def measure(module="app"):
+    """
+    Imports `module` in a fresh interpreter with -X importtime.
+    Returns a dict of {imported module name: (self_us, cumulative_us)}.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"'import {module}' failed:\n{result.stderr}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        # Format: "import time:      self [us] |    cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # Header line
+        timings[parts[2].strip()] = (self_us, cumulative_us)
+    return timings
+
+
+def heavy_imports(timings):
+    """Returns the heavy top-level packages that were imported."""
+    loaded = {name.split(".")[0] for name in timings}
+    return sorted(m for m in HEAVY_MODULES if m in loaded)
+
+
+def run_benchmark(module="app", repeat=5):
+    runs = [measure(module) for _ in range(repeat)]
+    totals_ms = [run[module][1] / 1000 for run in runs]
+    last = runs[-1]
+    slowest = sorted(last.items(), key=lambda kv: kv[1][1], reverse=True)
+    return {
+        "ts": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "module": module,
+        "repeat": repeat,
+        "median_ms": round(statistics.median(totals_ms), 2),
+        "min_ms": round(min(totals_ms), 2),
+        "modules_imported": len(last),
+        "heavy_modules": heavy_imports(last),
+        "slowest": [(name, round(cum / 1000, 2)) for name, (_, cum) in slowest[:10]],
+    }
+
+# =============================================================================
+# 3. MAIN EXECUTION
+# =============================================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark startup import time.")
+    parser.add_argument("--module", default="app", help="Module to import (default: app)")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of cold imports to run")
+    parser.add_argument("--record", action="store_true", help=f"Append the result to {os.path.basename(HISTORY_FILE)}")
+    parser.add_argument("--budget-ms", type=float, help="Fail if the median import time exceeds this")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.module, args.repeat)
+
+    print(f"import {report['module']}: median {report['median_ms']} ms, min {report['min_ms']} ms "
+          f"over {report['repeat']} runs ({report['modules_imported']} modules)")
+    print("Slowest imports (cumulative ms):")
+    for name, ms in report["slowest"]:
+        print(f"  {ms:>9.2f}  {name}")
+
+    if args.record:
+        with open(HISTORY_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(report, ensure_ascii=False) + "\n")
+        print(f"Recorded result in {HISTORY_FILE}")
+
+    failed = False
+    if report["heavy_modules"]:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(report['heavy_modules'])}")
+        failed = True
+    if args.budget_ms is not None and report["median_ms"] > args.budget_ms:
+        print(f"FAIL: median {report['median_ms']} ms exceeds budget of {args.budget_ms} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
@@ -1,18 +1,14 @@
 # =============================================================================
 # 1. IMPORTS
-# Standard Python libraries and external dependencies
+# Standard Python libraries only. The heavy external dependencies (mss, PIL,
+# sounddevice, soundfile) are imported inside the worker threads on first use
+# so that importing this module (and starting the GUI) stays fast.
 # =============================================================================
 import os
 import threading
 import time
 from queue import Queue
 from datetime import datetime
-import numpy as np
-from mss import mss
-from PIL import Image
-import sounddevice as sd
-# Removing scipy.io.wavfile.write and standardizing on soundfile (sf)
-import soundfile as sf 
 
 # =============================================================================
 # 2. CONFIGURATION & DIRECTORY SETUP
@@ -22,9 +18,7 @@ DATA_DIR = os.path.join(os.getcwd(), "data")
 SCREEN_DIR = os.path.join(DATA_DIR, "screenshots")
 AUDIO_DIR = os.path.join(DATA_DIR, "audio")
 
-# Create necessary directories if they do not exist
-os.makedirs(SCREEN_DIR, exist_ok=True)
-os.makedirs(AUDIO_DIR, exist_ok=True)
+# NOTE: Directories are created by the capturers when they start, not at import time.
 
 
 # =============================================================================
@@ -37,6 +31,7 @@ class ScreenCapturer(threading.Thread):
         self.interval = interval  # Time delay between captures
         self.out_queue = out_queue  # Queue to push metadata to main process
         self.running = threading.Event()  # Event flag to control thread execution
+        self.startup_error = None  # Set if the worker could not start (polled by the GUI)
         self.sct = None # Placeholder, initialized in run()
 
     # --- Thread Control Methods ---
@@ -52,9 +47,13 @@ class ScreenCapturer(threading.Thread):
     def run(self):
         # FIX: Initialize mss here, inside the thread's execution context.
         try:
+            from mss import mss
+            from PIL import Image
+            os.makedirs(SCREEN_DIR, exist_ok=True)
             self.sct = mss() 
         except Exception as e:
             print(f"Error initializing mss in worker thread: {e}")
+            self.startup_error = e
             self.running.clear()
             return
             
@@ -100,6 +99,7 @@ class AudioCapturer(threading.Thread):
         self.samplerate = samplerate
         self.out_queue = out_queue
         self.running = threading.Event()
+        self.startup_error = None  # Set if the worker could not start (polled by the GUI)
 
     def start_capture(self):
         self.running.set()
@@ -110,6 +110,17 @@ class AudioCapturer(threading.Thread):
         self.running.clear()
 
     def run(self):
+        try:
+            import sounddevice as sd
+            # Removing scipy.io.wavfile.write and standardizing on soundfile (sf)
+            import soundfile as sf
+            os.makedirs(AUDIO_DIR, exist_ok=True)
+        except Exception as e:
+            print(f"Error initializing audio capture in worker thread: {e}")
+            self.startup_error = e
+            self.running.clear()
+            return
+
         while True:
             if self.running.is_set():
                 try:
@@ -118,7 +129,7 @@ class AudioCapturer(threading.Thread):
 
                     print(f"[AUDIO] Recording {self.duration}s clip...")
                     
-                    # Record audio data using int16 format
+                    # Record audio data using int16 format (returns a numpy array)
                     audio_data = sd.rec(
                         int(self.duration * self.samplerate),
                         samplerate=self.samplerate,
@@ -1,6 +1,9 @@
 # =============================================================================
 # 1. IMPORTS
-# All necessary modules for the code snippet to function
+# All necessary modules for the code snippet to function.
+# External libraries required: opencv-python, pytesseract, Pillow (PIL).
+# These are imported lazily in Processor.run() to keep module import (and GUI
+# startup) fast.
 # =============================================================================
 import os
 import time
@@ -8,10 +11,6 @@ import json
 import threading
 from queue import Queue
 from datetime import datetime
-from PIL import Image
-# External libraries required: opencv-python, pytesseract, Pillow (PIL)
-import pytesseract
-import cv2
 
 
 # =============================================================================
@@ -20,7 +19,6 @@ import cv2
 # =============================================================================
 DATA_DIR = os.path.join(os.getcwd(), "data")
 SCREEN_DIR = os.path.join(DATA_DIR, "screenshots")
-os.makedirs(SCREEN_DIR, exist_ok=True) # Ensure directory exists for the main block
 
 
 # =============================================================================
@@ -33,6 +31,7 @@ class Processor(threading.Thread):
         self.in_queue = in_queue
         self.out_file = os.path.join(DATA_DIR, out_file)
         self.running = threading.Event()
+        self.startup_error = None  # Set if the worker could not start (polled by the GUI)
         self.screen_history = []  # Stores paths for frame-diff
     
     # Placeholder for the event inference logic
@@ -49,6 +48,17 @@ class Processor(threading.Thread):
         self.running.clear()
     
     def run(self):
+        # Heavy OCR / image libraries are loaded on first use, in the worker thread
+        try:
+            from PIL import Image
+            import pytesseract
+            import cv2
+        except Exception as e:
+            print(f"Error loading processing libraries in worker thread: {e}")
+            self.startup_error = e
+            self.running.clear()
+            return
+
         # Main thread loop
         while True:
             # Check if processing is active
@@ -139,6 +149,8 @@ if __name__ == "__main__":
     # NOTE: The original logic here is a *test harness* for monitoring a directory
     # and feeding the queue, simulating a capturer's output.
     
+    os.makedirs(SCREEN_DIR, exist_ok=True) # Ensure directory exists for the main block
+
     q = Queue()
     p = Processor(q)
     p.start_processing()
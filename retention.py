@@ -0,0 +1,435 @@
+"""
+retention.py
+Keeps the data directory within fixed age and size budgets.
+
+A low-priority background thread periodically:
+  * deletes screenshots / audio clips that are too old or over the size budget
+    (oldest first, in small batches so foreground capture I/O is not starved);
+  * rotates processed_events.jsonl once it grows past a threshold and compresses
+    the rotated segment to gzip (or zstd if `zstandard` is installed);
+  * drops the oldest compressed event segments once they exceed their budget.
+
+Compressed segments sit next to the live log as
+    processed_events-<YYYYmmddTHHMMSSffffff>.jsonl.gz
+and are streamed back, in order, by iter_log() (used by summarize.load_events).
+"""
+import os
+import re
+import sys
+import gzip
+import time
+import threading
+from datetime import datetime
+
+# =============================================================================
+# 1. CONFIGURATION
+# =============================================================================
+DATA_DIR = os.path.join(os.getcwd(), "data")
+SCREEN_DIR = os.path.join(DATA_DIR, "screenshots")
+AUDIO_DIR = os.path.join(DATA_DIR, "audio")
+EVENT_LOG = os.path.join(DATA_DIR, "processed_events.jsonl")
+
+MB = 1024 * 1024
+DAY = 24 * 60 * 60
+
+# Budgets per data type. Media entries are enforced file by file; the "events"
+# entry describes the JSONL log and its compressed segments.
+RETENTION_POLICIES = {
+    "screenshots": {"dir": SCREEN_DIR, "extensions": (".png",), "max_age_days": 7, "max_bytes": 2048 * MB},
+    "audio": {"dir": AUDIO_DIR, "extensions": (".wav",), "max_age_days": 3, "max_bytes": 1024 * MB},
+    "events": {
+        "log_file": EVENT_LOG,
+        "rotate_bytes": 8 * MB,      # Compact the live log once it reaches this size
+        "max_age_days": 30,          # Delete compressed segments older than this
+        "max_bytes": 256 * MB,       # Budget for all compressed segments together
+        "compression": "gzip",       # "gzip" or "zstd" (requires the zstandard package)
+    },
+}
+
+# Never touch files younger than this: the Processor may still be reading them
+MIN_FILE_AGE_SECONDS = 60
+
+COMPRESSED_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+STAMP_FORMAT = "%Y%m%dT%H%M%S%f"
+COPY_CHUNK_SIZE = 1 * MB
+
+# =============================================================================
+# 2. SEGMENT HELPERS
+# Shared by the retention worker (writer) and summarize.load_events (reader)
+# =============================================================================
+def _segment_pattern(log_file, tmp=False):
+    stem = os.path.splitext(os.path.basename(log_file))[0]
+    if tmp:
+        # Partial output of an interrupted compression
+        return re.compile(rf"^{re.escape(stem)}-(\d{{8}}T\d{{12}})\.jsonl(\.gz|\.zst)\.tmp$")
+    return re.compile(rf"^{re.escape(stem)}-(\d{{8}}T\d{{12}})\.jsonl(\.gz|\.zst)?$")
+
+
+def list_segments(log_file):
+    """
+    Returns the rotated segments of log_file as a list of (stamp, path), oldest first.
+    If a segment exists both uncompressed (being compacted) and compressed, only the
+    compressed file is returned so no event is read twice.
+    """
+    directory = os.path.dirname(log_file) or "."
+    pattern = _segment_pattern(log_file)
+    by_stamp = {}
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    for name in names:
+        match = pattern.match(name)
+        if not match:
+            continue
+        stamp, suffix = match.group(1), match.group(2)
+        # Prefer the compressed copy over a pending uncompressed one
+        if suffix or stamp not in by_stamp:
+            by_stamp[stamp] = os.path.join(directory, name)
+    return sorted(by_stamp.items())
+
+
+def open_segment(path):
+    """Opens a plain, gzip or zstd JSONL file for streaming text reads."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError(f"Reading {os.path.basename(path)} requires the 'zstandard' package.")
+        import io
+        raw = open(path, "rb")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True), encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def _open_segment_or_compressed(path):
+    """
+    Opens a segment, falling back to its compressed copy if the plain file was
+    compacted after it was listed. Returns None if the segment has been expired.
+    """
+    candidates = [path]
+    if path.endswith(".jsonl"):
+        candidates += [path + suffix for suffix in COMPRESSED_SUFFIXES.values()]
+    for candidate in candidates:
+        try:
+            return open_segment(candidate)
+        except FileNotFoundError:
+            continue
+    return None
+
+
+def iter_log(log_file):
+    """Yields every line of log_file: compressed segments first (oldest first), then the live file."""
+    last_stamp = ""
+    while True:
+        # Re-list until no newer segment shows up, so a rotation that happened
+        # while we were reading is picked up before the live file is opened.
+        pending = [(stamp, path) for stamp, path in list_segments(log_file) if stamp > last_stamp]
+        if pending:
+            for stamp, path in pending:
+                f = _open_segment_or_compressed(path)
+                last_stamp = stamp
+                if f is None:
+                    continue  # Expired by the retention worker
+                with f:
+                    for line in f:
+                        yield line
+            continue
+
+        try:
+            f = open_segment(log_file)
+        except FileNotFoundError:
+            # Rotated between the listing and the open: read the new segment first
+            if any(stamp > last_stamp for stamp, _ in list_segments(log_file)):
+                continue
+            return
+        with f:
+            # The log may also have been rotated (and a new live file started)
+            # between the listing and the open. Read any such segment before the
+            # live handle, unless the handle is that very segment.
+            live_stat = os.fstat(f.fileno())
+            for stamp, path in list_segments(log_file):
+                if stamp <= last_stamp:
+                    continue
+                try:
+                    if os.path.samestat(live_stat, os.stat(path)):
+                        break
+                except OSError:
+                    pass
+                segment = _open_segment_or_compressed(path)
+                last_stamp = stamp
+                if segment is None:
+                    continue
+                with segment:
+                    for line in segment:
+                        yield line
+            for line in f:
+                yield line
+        return
+
+
+def _compress_file(src, dst, compression, pause, running):
+    """
+    Streams src into a compressed dst, yielding to other threads between chunks.
+    Returns False (and leaves no partial file) if `running` is cleared part way.
+    """
+    tmp = dst + ".tmp"
+    completed = True
+    with open(src, "rb") as fin:
+        if compression == "zstd":
+            import zstandard
+            out = zstandard.ZstdCompressor(level=3).stream_writer(open(tmp, "wb"))
+        else:
+            out = gzip.open(tmp, "wb", compresslevel=6)
+        with out:
+            while True:
+                if not running.is_set():
+                    completed = False
+                    break
+                chunk = fin.read(COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                out.write(chunk)
+                time.sleep(pause)
+    if not completed:
+        os.remove(tmp)
+        return False
+    os.replace(tmp, dst)
+    return True
+
+
+def remove_stale_tmp_files(log_file):
+    """Deletes partial compressed segments left behind if the app exited mid-compression."""
+    directory = os.path.dirname(log_file) or "."
+    pattern = _segment_pattern(log_file, tmp=True)
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return
+    for name in names:
+        if pattern.match(name):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError as e:
+                print(f"Retention could not remove {name}: {e}")
+
+
+def _lower_thread_priority():
+    """
+    Best effort: run the calling thread at background priority.
+    On Windows this uses THREAD_MODE_BACKGROUND_BEGIN, which lowers both CPU and
+    disk I/O priority; on Linux it sets the thread's nice value to 19 (CPU only).
+    """
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+            kernel32 = ctypes.windll.kernel32
+            if not kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN):
+                print(f"Retention could not lower its priority (error {kernel32.GetLastError()})")
+        except Exception as e:
+            print(f"Retention could not lower its priority: {e}")
+    elif sys.platform.startswith("linux") and hasattr(os, "setpriority"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except OSError:
+            pass
+
+
+# =============================================================================
+# 3. RETENTION WORKER
+# =============================================================================
+class RetentionManager(threading.Thread):
+    def __init__(self, policies=None, interval=300.0, batch_size=100, batch_pause=0.5):
+        super().__init__(daemon=True)
+        # Copy so downgrading a policy below never changes the shared defaults
+        self.policies = {name: dict(policy) for name, policy in (policies or RETENTION_POLICIES).items()}
+        for policy in self.policies.values():
+            if policy.get("compression") == "zstd":
+                try:
+                    import zstandard  # noqa: F401
+                except ImportError:
+                    print("zstandard is not installed; compressing event segments with gzip instead.")
+                    policy["compression"] = "gzip"
+        self.interval = interval        # Seconds between sweeps
+        self.batch_size = batch_size    # Files deleted before pausing
+        self.batch_pause = batch_pause  # Pause between batches, leaves disk time to capture I/O
+        self.running = threading.Event()
+        self._wakeup = threading.Event()
+
+    # --- Thread Control Methods ---
+    def start_retention(self):
+        self.running.set()
+        if not self.is_alive():
+            self.start()
+
+    def stop_retention(self):
+        self.running.clear()
+        self._wakeup.set()
+
+    # --- Thread Execution Loop ---
+    def run(self):
+        _lower_thread_priority()
+        while self.running.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Retention sweep error: {e}")
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+    def sweep(self):
+        """Runs one pass over every policy."""
+        for name, policy in self.policies.items():
+            if not self.running.is_set():
+                return
+            if "log_file" in policy:
+                self.compact_log(policy)
+                self.enforce_segments(policy)
+            else:
+                removed = self.enforce_media(policy)
+                if removed:
+                    print(f"[RETENTION] Removed {removed} {name} files")
+
+    # --- Media (screenshots / audio) ---
+    def enforce_media(self, policy):
+        now = time.time()
+        files = []
+        try:
+            with os.scandir(policy["dir"]) as entries:
+                for entry in entries:
+                    if not entry.name.lower().endswith(policy["extensions"]):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    files.append((st.st_mtime, st.st_size, entry.path))
+        except FileNotFoundError:
+            return 0
+
+        files.sort()  # Oldest first
+        total = sum(size for _, size, _ in files)
+        max_age = policy["max_age_days"] * DAY
+        doomed = []
+        for mtime, size, path in files:
+            age = now - mtime
+            if age < MIN_FILE_AGE_SECONDS:
+                break
+            if age > max_age or total > policy["max_bytes"]:
+                doomed.append(path)
+                total -= size
+            else:
+                break
+        return self._delete_in_batches(doomed)
+
+    def _delete_in_batches(self, paths):
+        removed = 0
+        for i, path in enumerate(paths):
+            if i and i % self.batch_size == 0:
+                if not self.running.is_set():
+                    break
+                time.sleep(self.batch_pause)
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Retention could not remove {path}: {e}")
+        return removed
+
+    # --- Event log (JSONL) ---
+    def compact_log(self, policy):
+        """Rotates the live log once it is large enough, then compresses pending segments."""
+        log_file = policy["log_file"]
+        # Only this thread compresses, so any .tmp output here is from an interrupted run
+        remove_stale_tmp_files(log_file)
+        compression = policy.get("compression", "gzip")
+
+        try:
+            if os.path.getsize(log_file) >= policy["rotate_bytes"]:
+                stamp = datetime.utcnow().strftime(STAMP_FORMAT)
+                stem = os.path.splitext(log_file)[0]
+                # Atomic rename: the Processor reopens the log for every record,
+                # so its next write simply starts a fresh live file.
+                os.replace(log_file, f"{stem}-{stamp}.jsonl")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            # e.g. the file is momentarily open on Windows; try again next sweep
+            print(f"Retention could not rotate {log_file}: {e}")
+
+        # Compress every uncompressed segment (including ones left by an earlier crash)
+        for stamp, path in list_segments(log_file):
+            if not path.endswith(".jsonl"):
+                continue
+            if not self.running.is_set():
+                return
+            # Give any write that raced with the rename a moment to land
+            try:
+                if time.time() - os.path.getmtime(path) < 1.0:
+                    continue
+                if _compress_file(path, path + COMPRESSED_SUFFIXES[compression], compression,
+                                  pause=0.01, running=self.running):
+                    os.remove(path)
+            except OSError as e:
+                print(f"Retention could not compress {path}: {e}")
+
+    def enforce_segments(self, policy):
+        """Deletes the oldest compressed segments that are expired or over budget."""
+        now = time.time()
+        segments = []
+        for _, path in list_segments(policy["log_file"]):
+            if path.endswith(".jsonl"):
+                continue  # Not compacted yet
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            segments.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in segments)
+        max_age = policy["max_age_days"] * DAY
+        doomed = []
+        for mtime, size, path in segments:  # Already oldest first (by stamp)
+            if now - mtime > max_age or total > policy["max_bytes"]:
+                doomed.append(path)
+                total -= size
+            else:
+                break
+        return self._delete_in_batches(doomed)
+
+
+def disk_usage(policies=None):
+    """Returns {data type: bytes on disk}; handy for checking the budgets."""
+    usage = {}
+    for name, policy in (policies or RETENTION_POLICIES).items():
+        if "log_file" in policy:
+            paths = [p for _, p in list_segments(policy["log_file"])] + [policy["log_file"]]
+        else:
+            try:
+                paths = [os.path.join(policy["dir"], n) for n in os.listdir(policy["dir"])]
+            except FileNotFoundError:
+                paths = []
+        total = 0
+        for path in paths:
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                pass
+        usage[name] = total
+    return usage
+
+# =============================================================================
+# 4. MAIN EXECUTION
+# Runs a single sweep and reports disk usage before and after
+# =============================================================================
+if __name__ == "__main__":
+    print(f"Before: {disk_usage()}")
+    manager = RetentionManager()
+    manager.running.set()
+    manager.sweep()
+    print(f"After:  {disk_usage()}")
@@ -4,6 +4,8 @@ Reads workflows.jsonl, groups similar events and produces simple JSON workflow s
 import os
 import json
 from collections import Counter, defaultdict
+# Streams the live log plus any gzip/zstd segments compacted by the retention worker
+from retention import iter_log
 
 # =============================================================================
 # 1. CONFIGURATION
@@ -22,13 +24,20 @@ KEYWORDS_TO_WORKFLOW = {
 # =============================================================================
 # 2. DATA LOADING
 # =============================================================================
-def load_events(path=INPUT_FILE):
-    """Loads a list of event dictionaries from a JSONL file."""
-    if not os.path.exists(path):
-        return []
-    with open(path, "r", encoding="utf-8") as f:
+def iter_events(path=INPUT_FILE):
+    """
+    Streams event dictionaries from a JSONL file, including its compressed
+    segments (oldest first) rotated out by retention.py.
+    """
+    for line in iter_log(path):
         # Load each non-empty line as a JSON object
-        return [json.loads(line) for line in f if line.strip()]
+        if line.strip():
+            yield json.loads(line)
+
+
+def load_events(path=INPUT_FILE):
+    """Loads a list of event dictionaries from a JSONL file and its compressed segments."""
+    return list(iter_events(path))
 
 # =============================================================================
 # 3. ANALYSIS AND SUMMARIZATION LOGIC (Indentation Corrected)
@@ -36,7 +45,8 @@ def load_events(path=INPUT_FILE):
 def summarize(events):
     """
     Groups events based on inferred event types and counts their occurrences.
-    Collects up to 3 examples for each type.
+    Collects up to 3 examples for each type. `events` may be any iterable
+    (e.g. iter_events()), it is only traversed once.
     """
     counter = Counter()
     examples = defaultdict(list)
@@ -0,0 +1,113 @@
+"""
+task_executor.py
+Runs slow jobs (summarizing, stopping capture, deleting data) off the Tk main thread.
+Progress, results and errors are handed back to the UI through root.after, so
+widgets are only ever touched from the main thread.
+"""
+import threading
+from queue import Queue, Empty
+
+# =============================================================================
+# 1. TASK HANDLE
+# The object passed to every job; used to report progress and check for cancel
+# =============================================================================
+class TaskCancelled(Exception):
+    """Raised inside a job when the user cancelled it."""
+
+
+class Task:
+    def __init__(self, executor, name, fn, on_progress=None, on_done=None, on_error=None, on_cancelled=None):
+        self.executor = executor
+        self.name = name
+        self.fn = fn
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancelled = on_cancelled
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        """Call this between units of work; aborts the job if it was cancelled."""
+        if self.cancel_event.is_set():
+            raise TaskCancelled(self.name)
+
+    def progress(self, message, fraction=None):
+        """Reports progress from the worker thread (delivered on the UI thread)."""
+        if self.on_progress:
+            self.executor._post(self.on_progress, message, fraction)
+
+
+# =============================================================================
+# 2. EXECUTOR
+# Each lane has its own worker running jobs in FIFO order, so a quick job on one
+# lane never waits behind a long one on another; the UI polls for results
+# =============================================================================
+class TaskExecutor:
+    def __init__(self, root, poll_interval_ms=100):
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self.lanes = {}  # lane name -> Queue of tasks waiting for that lane's worker
+        self.callbacks = Queue()  # (callback, args) to run on the Tk thread
+        self._poll()
+
+    # --- Public API (call from the Tk thread) ---
+    def submit(self, name, fn, on_progress=None, on_done=None, on_error=None, on_cancelled=None, lane="default"):
+        """
+        Queues fn(task) on the given lane and returns its Task.
+        on_done(result), on_error(exc), on_cancelled() and on_progress(message, fraction)
+        are all invoked on the Tk main thread.
+        """
+        task = Task(self, name, fn, on_progress, on_done, on_error, on_cancelled)
+        if lane not in self.lanes:
+            # Lanes (and their worker threads) are created on first use
+            self.lanes[lane] = Queue()
+            threading.Thread(target=self._run, args=(self.lanes[lane],), daemon=True).start()
+        self.lanes[lane].put(task)
+        return task
+
+    # --- Worker threads (one per lane) ---
+    def _run(self, jobs):
+        while True:
+            task = jobs.get()
+            if task.cancelled:
+                # Cancelled before it ever started
+                if task.on_cancelled:
+                    self._post(task.on_cancelled)
+                continue
+
+            try:
+                result = task.fn(task)
+            except TaskCancelled:
+                if task.on_cancelled:
+                    self._post(task.on_cancelled)
+            except Exception as e:
+                if task.on_error:
+                    self._post(task.on_error, e)
+                else:
+                    print(f"Background task '{task.name}' failed: {e}")
+            else:
+                if task.on_done:
+                    self._post(task.on_done, result)
+
+    def _post(self, callback, *args):
+        self.callbacks.put((callback, args))
+
+    # --- Tk thread: drain callbacks posted by the worker ---
+    def _poll(self):
+        while True:
+            try:
+                callback, args = self.callbacks.get_nowait()
+            except Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Task callback error: {e}")
+        self.root.after(self.poll_interval_ms, self._poll)